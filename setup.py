@@ -22,9 +22,9 @@ setup(
     ],
     package_data={'travisci.resources': ['loggingConfiguration.json', 'loggingConfiguration.json']},
     include_package_data=True,
-    install_requires=['click', 'PyTravisCI'],
+    install_requires=['click', 'PyTravisCI', 'requests'],
     entry_points='''
         [console_scripts]
-        traviscli=travisci.TravisCli:commandHandler
+        traviscli=travisci.TravisCli:mainHandler
     ''',
 )
@@ -0,0 +1,145 @@
+from typing import Dict
+from typing import List
+from typing import Union
+
+from logging import Logger
+from logging import getLogger
+
+from os import remove as osRemove
+from os.path import exists as osPathExists
+
+from tempfile import gettempdir
+
+from unittest import skipIf
+
+from tests.TestBase import TestBase
+
+try:
+    from requests import ConnectionError
+    from requests import HTTPError
+    from travisci.AccessPointResolver import AccessPointResolver
+    from travisci.exceptions.AccessPointNotFound import AccessPointNotFound
+    from travisci.exceptions.ApiTokenRejected import ApiTokenRejected
+except ImportError:     # requests is not installed
+    AccessPointResolver = None
+
+COM: str = 'https://api.travis-ci.com'
+ORG: str = 'https://api.travis-ci.org'
+
+
+class FakeResponse:
+
+    def __init__(self, statusCode: int):
+        self.status_code: int = statusCode
+
+
+class FakeApiSession:
+    """
+    Answers repository requests with a fixed status per end point, or raises the end point's exception
+    """
+    def __init__(self, accessPoint: str, statusCodes: Dict[str, Union[int, Exception]], probed: List[str]):
+        self._accessPoint: str                              = accessPoint
+        self._statusCodes: Dict[str, Union[int, Exception]] = statusCodes
+        self._probed:      List[str]                        = probed
+
+    def repositoryUrl(self, repoSlugName: str) -> str:
+        return f'{self._accessPoint}/repo/{repoSlugName}'
+
+    def get(self, url: str, timeout: int) -> FakeResponse:
+        self._probed.append(self._accessPoint)
+        answer: Union[int, Exception] = self._statusCodes[self._accessPoint]
+        if isinstance(answer, Exception):
+            raise answer
+        return FakeResponse(answer)
+
+    def close(self):
+        pass
+
+
+@skipIf(AccessPointResolver is None, 'requests is required')
+class TestAccessPointResolver(TestBase):
+    """
+    Exercises end point probing and the per repository cache
+    """
+    clsLogger: Logger = None
+
+    CACHE_FILE_NAME: str = f'{gettempdir()}/TestAccessPointResolver.json'
+
+    @classmethod
+    def setUpClass(cls):
+        TestBase.setUpLogging()
+        TestAccessPointResolver.clsLogger = getLogger(__name__)
+
+    def setUp(self):
+        self.logger: Logger    = TestAccessPointResolver.clsLogger
+        self._probed: List[str] = []
+        self._removeCacheFile()
+
+    def tearDown(self):
+        self._removeCacheFile()
+
+    def testFindsHostingEndPoint(self):
+
+        resolver: AccessPointResolver = self._createResolver({COM: 404, ORG: 200})
+
+        self.assertEqual(ORG, resolver.resolve('hasii2011/PyUt'))
+        self.assertEqual({COM, ORG}, set(self._probed))
+
+    def testRemembersEndPoint(self):
+
+        self._createResolver({COM: 200, ORG: 404}).resolve('hasii2011/PyUt')
+        self._probed.clear()
+
+        self.assertEqual(COM, self._createResolver({COM: 200, ORG: 404}).resolve('hasii2011/PyUt'))
+        self.assertEqual([], self._probed)
+
+    def testForgetProbesAgain(self):
+
+        resolver: AccessPointResolver = self._createResolver({COM: 200, ORG: 404})
+        resolver.resolve('hasii2011/PyUt')
+        resolver.forget('hasii2011/PyUt')
+        self._probed.clear()
+
+        resolver.resolve('hasii2011/PyUt')
+        self.assertIn(COM, self._probed)
+
+    def testRepositoryNotFound(self):
+
+        resolver: AccessPointResolver = self._createResolver({COM: 404, ORG: 404})
+
+        self.assertRaises(AccessPointNotFound, resolver.resolve, 'hasii2011/PyUt')
+
+    def testUnreachableEndPointsAreNotReportedAsNotFound(self):
+
+        resolver: AccessPointResolver = self._createResolver({COM: ConnectionError('DNS failure'), ORG: ConnectionError('DNS failure')})
+
+        self.assertRaises(ConnectionError, resolver.resolve, 'hasii2011/PyUt')
+
+    def testServerErrorIsNotReportedAsNotFound(self):
+
+        resolver: AccessPointResolver = self._createResolver({COM: 503, ORG: 404})
+
+        self.assertRaises(HTTPError, resolver.resolve, 'hasii2011/PyUt')
+
+    def testReachableEndPointWinsOverUnreachableOne(self):
+
+        resolver: AccessPointResolver = self._createResolver({COM: ConnectionError('DNS failure'), ORG: 200})
+
+        self.assertEqual(ORG, resolver.resolve('hasii2011/PyUt'))
+
+    def testRejectedTokenIsNotReportedAsNotFound(self):
+
+        resolver: AccessPointResolver = self._createResolver({COM: 403, ORG: 401})
+
+        self.assertRaises(ApiTokenRejected, resolver.resolve, 'hasii2011/PyUt')
+
+    def _createResolver(self, statusCodes: Dict[str, Union[int, Exception]]) -> AccessPointResolver:
+
+        def sessionFactory(accessPoint: str) -> FakeApiSession:
+            return FakeApiSession(accessPoint, statusCodes, self._probed)
+
+        return AccessPointResolver(candidates=(COM, ORG), sessionFactory=sessionFactory, cacheFileName=TestAccessPointResolver.CACHE_FILE_NAME)
+
+    def _removeCacheFile(self):
+        if osPathExists(TestAccessPointResolver.CACHE_FILE_NAME):
+            osRemove(TestAccessPointResolver.CACHE_FILE_NAME)
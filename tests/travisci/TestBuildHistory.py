@@ -0,0 +1,220 @@
+from typing import List
+
+from logging import Logger
+from logging import getLogger
+
+from math import isnan
+
+from os import remove as osRemove
+from os.path import exists as osPathExists
+
+from sys import byteorder
+
+from tempfile import gettempdir
+
+from unittest.mock import patch
+
+from tests.TestBase import TestBase
+
+from travisci.BuildHistory import BuildHistory
+from travisci.BuildHistory import BuildHistoryError
+
+
+class FakeResponse:
+
+    def __init__(self, page: dict):
+        self._page = page
+
+    def raise_for_status(self):
+        pass
+
+    def json(self) -> dict:
+        return self._page
+
+
+class FakeApiSession:
+    """
+    Serves a newest first build list by offset;  newBuildsAfterFirstPage simulates builds that
+    start while the client is paging
+    """
+    def __init__(self, newestNumber: int, newBuildsAfterFirstPage: int = 0, accessPoint: str = 'https://api.travis-ci.com'):
+        self._newestNumber:            int = newestNumber
+        self._newBuildsAfterFirstPage: int = newBuildsAfterFirstPage
+        self.accessPoint:              str = accessPoint
+        self.requestCount:             int = 0
+
+    def buildsUrl(self, repoSlugName: str) -> str:
+        return f'{self.accessPoint}/repo/{repoSlugName}/builds'
+
+    def get(self, url: str, params: dict, timeout: int) -> FakeResponse:
+
+        assert params['sort_by'] == 'number:desc', 'Paging relies on newest first order'
+
+        if self.requestCount == 1:
+            self._newestNumber += self._newBuildsAfterFirstPage
+        self.requestCount += 1
+
+        first:   int       = self._newestNumber - params['offset']
+        numbers: List[int] = list(range(first, max(first - params['limit'], 0), -1))
+        builds:  List[dict] = [{'number': str(number), 'state': 'passed', 'duration': 60,
+                                'started_at': '2022-06-01T12:00:00Z', 'branch': {'name': 'master'}} for number in numbers]
+
+        return FakeResponse({'builds': builds, '@pagination': {'is_last': first - params['limit'] <= 0}})
+
+
+class TestBuildHistory(TestBase):
+    """
+    Exercises the compact build columns, snapshots and incremental paging
+    """
+    clsLogger: Logger = None
+
+    SNAPSHOT_FILE_NAME: str = f'{gettempdir()}/TestBuildHistory.snapshot'
+
+    @classmethod
+    def setUpClass(cls):
+        TestBase.setUpLogging()
+        TestBuildHistory.clsLogger = getLogger(__name__)
+
+    def setUp(self):
+        self.logger: Logger = TestBuildHistory.clsLogger
+        self._removeSnapshotFile()
+
+    def tearDown(self):
+        self._removeSnapshotFile()
+
+    def testSnapshotRoundTrip(self):
+
+        buildHistory: BuildHistory = self._createBuildHistory()
+        buildHistory.save(TestBuildHistory.SNAPSHOT_FILE_NAME)
+
+        loaded: BuildHistory = BuildHistory.load(TestBuildHistory.SNAPSHOT_FILE_NAME)
+
+        self._assertSameHistory(buildHistory, loaded)
+
+    def testSnapshotFromOtherByteOrder(self):
+
+        buildHistory: BuildHistory = self._createBuildHistory()
+        foreign:      BuildHistory = self._createBuildHistory()
+        for column in foreign._columns():
+            column.byteswap()
+
+        otherByteOrder: str = 'big' if byteorder == 'little' else 'little'
+        with patch('travisci.BuildHistory.byteorder', otherByteOrder):
+            foreign.save(TestBuildHistory.SNAPSHOT_FILE_NAME)
+
+        loaded: BuildHistory = BuildHistory.load(TestBuildHistory.SNAPSHOT_FILE_NAME)
+
+        self._assertSameHistory(buildHistory, loaded)
+
+    def testForeignFileIsRejected(self):
+
+        with open(TestBuildHistory.SNAPSHOT_FILE_NAME, 'w') as snapshotFile:
+            snapshotFile.write('0.3.2+.13')
+
+        self.assertRaises(BuildHistoryError, BuildHistory.load, TestBuildHistory.SNAPSHOT_FILE_NAME)
+
+    def testSnapshotOfOtherRepositoryIsRejected(self):
+
+        buildHistory: BuildHistory = BuildHistory()
+        buildHistory.fetchNewer(FakeApiSession(newestNumber=5), 'hasii2011/PyUt')
+        buildHistory.save(TestBuildHistory.SNAPSHOT_FILE_NAME)
+
+        self.assertEqual('hasii2011/PyUt', BuildHistory.load(TestBuildHistory.SNAPSHOT_FILE_NAME, repoSlugName='hasii2011/PyUt').repoSlugName)
+        self.assertRaises(BuildHistoryError, BuildHistory.load, TestBuildHistory.SNAPSHOT_FILE_NAME, repoSlugName='hasii2011/traviscli')
+
+    def testHistoryFromOtherEndPointIsNotExtended(self):
+
+        buildHistory: BuildHistory = BuildHistory()
+        buildHistory.fetchNewer(FakeApiSession(newestNumber=5), 'hasii2011/PyUt')
+
+        self.assertRaises(BuildHistoryError, buildHistory.fetchNewer, FakeApiSession(newestNumber=5, accessPoint='https://api.travis-ci.org'), 'hasii2011/PyUt')
+
+    def testTruncatedSnapshotIsRejected(self):
+
+        self._createBuildHistory().save(TestBuildHistory.SNAPSHOT_FILE_NAME)
+        with open(TestBuildHistory.SNAPSHOT_FILE_NAME, 'rb') as snapshotFile:
+            contents: bytes = snapshotFile.read()
+        with open(TestBuildHistory.SNAPSHOT_FILE_NAME, 'wb') as snapshotFile:
+            snapshotFile.write(contents[:-5])
+
+        self.assertRaises(BuildHistoryError, BuildHistory.load, TestBuildHistory.SNAPSHOT_FILE_NAME)
+
+    def testResumeNumberOfEmptyHistory(self):
+        self.assertEqual(0, BuildHistory().resumeNumber)
+
+    def testResumeNumberIsNewestWhenAllFinished(self):
+
+        buildHistory: BuildHistory = BuildHistory()
+        buildHistory.append(number=1, state='passed', duration=10, startedAt=1000.0, branch='master')
+        buildHistory.append(number=2, state='failed', duration=10, startedAt=2000.0, branch='master')
+
+        self.assertEqual(2, buildHistory.resumeNumber)
+
+    def testResumeNumberIsOldestUnfinished(self):
+        self.assertEqual(3, self._createBuildHistory().resumeNumber, 'Unknown states count as unfinished')
+
+    def testDiscardFrom(self):
+
+        buildHistory: BuildHistory = self._createBuildHistory()
+        buildHistory.discardFrom(3)
+
+        self.assertEqual([2, 1], list(buildHistory.numbers))
+        self.assertEqual(2, len(buildHistory.startedAt))
+        self.assertEqual(2, len(buildHistory.branches))
+
+    def testFetchAll(self):
+
+        buildHistory: BuildHistory = BuildHistory()
+        added:        int          = buildHistory.fetchNewer(FakeApiSession(newestNumber=250), 'hasii2011/PyUt')
+
+        self.assertEqual(250, added)
+        self.assertEqual(set(range(1, 251)), set(buildHistory.numbers))
+
+    def testFetchSkipsBuildsShiftedByNewArrivals(self):
+
+        buildHistory: BuildHistory = BuildHistory()
+        added:        int          = buildHistory.fetchNewer(FakeApiSession(newestNumber=250, newBuildsAfterFirstPage=1), 'hasii2011/PyUt')
+
+        self.assertEqual(250, added)
+        self.assertEqual(len(buildHistory.numbers), len(set(buildHistory.numbers)))
+
+    def testFetchNewerOnlyFetchesIncrement(self):
+
+        buildHistory: BuildHistory = BuildHistory()
+        buildHistory.fetchNewer(FakeApiSession(newestNumber=250), 'hasii2011/PyUt')
+
+        apiSession: FakeApiSession = FakeApiSession(newestNumber=260)
+        added:      int            = buildHistory.fetchNewer(apiSession, 'hasii2011/PyUt')
+
+        self.assertEqual(11, added, 'The newest known build is fetched again')
+        self.assertEqual(1, apiSession.requestCount)
+        self.assertEqual(set(range(1, 261)), set(buildHistory.numbers))
+        self.assertEqual(260, len(buildHistory))
+
+    def _createBuildHistory(self) -> BuildHistory:
+
+        buildHistory: BuildHistory = BuildHistory()
+        buildHistory.append(number=4, state='started',  duration=None, startedAt=4000.0, branch='feature')
+        buildHistory.append(number=3, state='mystery',  duration=None, startedAt=None,   branch='master')
+        buildHistory.append(number=2, state='failed',   duration=120,  startedAt=2000.0, branch='master')
+        buildHistory.append(number=1, state='passed',   duration=60,   startedAt=1000.0, branch='master')
+
+        return buildHistory
+
+    def _assertSameHistory(self, expected: BuildHistory, actual: BuildHistory):
+
+        self.assertEqual(list(expected.numbers),   list(actual.numbers))
+        self.assertEqual(list(expected.states),    list(actual.states))
+        self.assertEqual(list(expected.durations), list(actual.durations))
+        self.assertEqual(list(expected.branches),  list(actual.branches))
+        self.assertEqual(expected.stateNames,      actual.stateNames)
+        self.assertEqual(expected.branchNames,     actual.branchNames)
+        for expectedStart, actualStart in zip(expected.startedAt, actual.startedAt):
+            if isnan(expectedStart):
+                self.assertTrue(isnan(actualStart))
+            else:
+                self.assertEqual(expectedStart, actualStart)
+
+    def _removeSnapshotFile(self):
+        if osPathExists(TestBuildHistory.SNAPSHOT_FILE_NAME):
+            osRemove(TestBuildHistory.SNAPSHOT_FILE_NAME)
@@ -0,0 +1,99 @@
+from typing import List
+
+from logging import Logger
+from logging import getLogger
+
+from math import isnan
+
+from tests.TestBase import TestBase
+
+from travisci.BuildHistory import BuildHistory
+from travisci.BuildStatistics import ALL_BRANCHES
+from travisci.BuildStatistics import SECONDS_PER_DAY
+from travisci.BuildStatistics import BuildStatistics
+from travisci.BuildStatistics import WindowStatistics
+
+NOW: float = 1_700_000_000.0
+
+
+class TestBuildStatistics(TestBase):
+    """
+    Exercises percentiles, success rates and windowing over a small hand built history
+    """
+    clsLogger: Logger = None
+
+    @classmethod
+    def setUpClass(cls):
+        TestBase.setUpLogging()
+        TestBuildStatistics.clsLogger = getLogger(__name__)
+
+    def setUp(self):
+        self.logger: Logger = TestBuildStatistics.clsLogger
+
+        buildHistory: BuildHistory = BuildHistory()
+        # Last day on master:  3 passed, 1 failed
+        buildHistory.append(number=10, state='passed',  duration=100, startedAt=NOW - 3600,                    branch='master')
+        buildHistory.append(number=9,  state='passed',  duration=200, startedAt=NOW - 7200,                    branch='master')
+        buildHistory.append(number=8,  state='passed',  duration=300, startedAt=NOW - 10800,                   branch='master')
+        buildHistory.append(number=7,  state='failed',  duration=400, startedAt=NOW - 14400,                   branch='master')
+        # Never started;  Only counted in the full history
+        buildHistory.append(number=6,  state='canceled', duration=None, startedAt=None,                        branch='master')
+        # Ten days ago on a feature branch
+        buildHistory.append(number=5,  state='errored', duration=50,  startedAt=NOW - 10 * SECONDS_PER_DAY,   branch='feature')
+
+        self._buildStatistics: BuildStatistics = BuildStatistics(buildHistory)
+
+    def testPercentileNearestRank(self):
+
+        values: List[int] = list(range(1, 21))
+
+        self.assertEqual(10.0, self._buildStatistics._percentile(values, 50))
+        self.assertEqual(18.0, self._buildStatistics._percentile(values, 90))
+        self.assertEqual(19.0, self._buildStatistics._percentile(values, 95))
+        self.assertEqual(1.0,  self._buildStatistics._percentile(values, 0))
+        self.assertEqual(7.0,  self._buildStatistics._percentile([7], 95))
+
+    def testPercentileOfNothing(self):
+        self.assertTrue(isnan(self._buildStatistics._percentile([], 50)))
+
+    def testWindowExcludesUnstartedAndOldBuilds(self):
+
+        stats: WindowStatistics = self._find(self._buildStatistics.compute(windowDays=(7,), topBranches=5, now=NOW), ALL_BRANCHES, 7)
+
+        self.assertEqual(4, stats.buildCount)
+        self.assertEqual(0.75, stats.successRate)
+        self.assertEqual(200.0, stats.p50Duration)
+        self.assertEqual(400.0, stats.p95Duration)
+        self.assertAlmostEqual(4 / 7, stats.buildsPerDay)
+
+    def testFullHistoryIncludesEverything(self):
+
+        stats: WindowStatistics = self._find(self._buildStatistics.compute(windowDays=(0,), topBranches=5, now=NOW), ALL_BRANCHES, 0)
+
+        self.assertEqual(6, stats.buildCount)
+        self.assertEqual(3 / 5, stats.successRate, 'Canceled builds do not decide the success rate')
+        self.assertAlmostEqual(6 / 10, stats.buildsPerDay)
+
+    def testPerBranch(self):
+
+        results: List[WindowStatistics] = self._buildStatistics.compute(windowDays=(30,), topBranches=5, now=NOW)
+
+        self.assertEqual(4, self._find(results, 'master', 30).buildCount)
+        self.assertEqual(0.0, self._find(results, 'feature', 30).successRate)
+
+    def testEmptyWindow(self):
+
+        stats: WindowStatistics = self._find(self._buildStatistics.compute(windowDays=(30,), topBranches=5, now=NOW + 365 * SECONDS_PER_DAY), ALL_BRANCHES, 30)
+
+        self.assertEqual(0, stats.buildCount)
+        self.assertTrue(isnan(stats.successRate))
+        self.assertTrue(isnan(stats.p90Duration))
+
+    def testTopBranchesLimitsReport(self):
+
+        results: List[WindowStatistics] = self._buildStatistics.compute(windowDays=(7, 0), topBranches=1, now=NOW)
+
+        self.assertEqual([ALL_BRANCHES, 'master', ALL_BRANCHES, 'master'], [stats.branch for stats in results])
+
+    def _find(self, results: List[WindowStatistics], branch: str, windowDays: int) -> WindowStatistics:
+        return next(stats for stats in results if stats.branch == branch and stats.windowDays == windowDays)
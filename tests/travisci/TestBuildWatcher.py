@@ -0,0 +1,138 @@
+from typing import Dict
+from typing import List
+
+from logging import Logger
+from logging import getLogger
+
+from unittest import skipIf
+
+from tests.TestBase import TestBase
+
+try:
+    from requests import ConnectionError
+    from travisci.BuildWatcher import BuildWatcher
+except ImportError:     # requests is not installed
+    BuildWatcher = None
+
+ETAG:          str = '"d41d8cd98f00b204e9800998ecf8427e"'
+LAST_MODIFIED: str = 'Wed, 01 Jun 2022 12:00:00 GMT'
+
+MINIMUM_INTERVAL: float = 10.0
+MAXIMUM_INTERVAL: float = 60.0
+
+
+class FakeResponse:
+
+    def __init__(self, statusCode: int, build: Dict[str, str] = None):
+        self.status_code: int            = statusCode
+        self.headers:     Dict[str, str] = {'ETag': ETAG, 'Last-Modified': LAST_MODIFIED}
+        self._build:      Dict[str, str] = build
+
+    def raise_for_status(self):
+        pass
+
+    def json(self) -> dict:
+        return {'builds': [self._build]}
+
+
+class FakeApiSession:
+    """
+    Answers each poll with the next queued response, or raises it if it is an exception;  Records
+    the headers of every request
+    """
+    def __init__(self):
+        self.answers:        List       = []
+        self.requestHeaders: List[Dict] = []
+
+    def buildsUrl(self, repoSlugName: str) -> str:
+        return f'https://api.travis-ci.com/repo/{repoSlugName}/builds'
+
+    def get(self, url: str, params: dict, headers: Dict[str, str], timeout: int) -> FakeResponse:
+
+        self.requestHeaders.append(dict(headers))
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    def close(self):
+        pass
+
+
+@skipIf(BuildWatcher is None, 'requests is required')
+class TestBuildWatcher(TestBase):
+    """
+    Exercises conditional polling and the adaptive poll interval
+    """
+    clsLogger: Logger = None
+
+    @classmethod
+    def setUpClass(cls):
+        TestBase.setUpLogging()
+        TestBuildWatcher.clsLogger = getLogger(__name__)
+
+    def setUp(self):
+        self.logger:      Logger         = TestBuildWatcher.clsLogger
+        self._apiSession: FakeApiSession = FakeApiSession()
+        self._watcher:    BuildWatcher   = BuildWatcher(apiSession=self._apiSession, repoSlugName='hasii2011/PyUt',
+                                                        minimumInterval=MINIMUM_INTERVAL, maximumInterval=MAXIMUM_INTERVAL)
+
+    def testValidatorsAreSentBack(self):
+
+        self._answer(self._build('42', 'passed'), FakeResponse(BuildWatcher.NOT_MODIFIED))
+        self._watcher.start()
+        self._watcher.poll()
+
+        self.assertEqual({}, self._apiSession.requestHeaders[0])
+        self.assertEqual({'If-None-Match': ETAG, 'If-Modified-Since': LAST_MODIFIED}, self._apiSession.requestHeaders[1])
+
+    def testNotModifiedKeepsPreviousBuild(self):
+
+        self._answer(self._build('42', 'passed'), FakeResponse(BuildWatcher.NOT_MODIFIED))
+        self._watcher.start()
+
+        self.assertEqual(('42', 'passed'), self._watcher.poll())
+
+    def testIdleIntervalDoublesUpToMaximum(self):
+
+        self._answer(self._build('42', 'passed'), *[FakeResponse(BuildWatcher.NOT_MODIFIED)] * 4)
+        self._watcher.start()
+
+        intervals: List[float] = []
+        for x in range(4):
+            self._watcher.poll()
+            intervals.append(self._watcher.interval)
+
+        self.assertEqual([20.0, 40.0, 60.0, 60.0], intervals)
+
+    def testNewBuildResetsInterval(self):
+
+        self._answer(self._build('42', 'passed'), FakeResponse(BuildWatcher.NOT_MODIFIED), self._build('43', 'passed'))
+        self._watcher.start()
+        self._watcher.poll()
+        self.assertEqual(20.0, self._watcher.interval)
+
+        self._watcher.poll()
+        self.assertEqual(MINIMUM_INTERVAL, self._watcher.interval)
+
+    def testActiveBuildKeepsMinimumInterval(self):
+
+        self._answer(self._build('42', 'started'), FakeResponse(BuildWatcher.NOT_MODIFIED))
+        self._watcher.start()
+        self._watcher.poll()
+
+        self.assertEqual(MINIMUM_INTERVAL, self._watcher.interval)
+
+    def testFailedPollKeepsBuildAndBacksOff(self):
+
+        self._answer(self._build('42', 'passed'), ConnectionError('Travis CI is unreachable'))
+        self._watcher.start()
+
+        self.assertEqual(('42', 'passed'), self._watcher.poll())
+        self.assertEqual(20.0, self._watcher.interval)
+
+    def _answer(self, *answers):
+        self._apiSession.answers.extend(answers)
+
+    def _build(self, number: str, state: str) -> FakeResponse:
+        return FakeResponse(200, {'number': number, 'state': state})
@@ -0,0 +1,102 @@
+from logging import Logger
+from logging import getLogger
+
+from os import remove as osRemove
+from os.path import exists as osPathExists
+
+from multiprocessing import Pool
+
+from tempfile import gettempdir
+
+from tests.TestBase import TestBase
+
+from travisci.RateLimiter import RateLimiter
+
+from travisci.exceptions.RateLimitWaitExceeded import RateLimitWaitExceeded
+
+
+def drainBudget(stateFileName: str) -> int:
+    """
+    Runs in a separate process;  Takes tokens until the shared bucket refuses
+
+    Returns:  The number of tokens taken
+    """
+    rateLimiter: RateLimiter = RateLimiter(requestsPerMinute=1, burstSize=40, maximumWait=0.0, stateFileName=stateFileName)
+    taken:       int         = 0
+    try:
+        while True:
+            rateLimiter.acquire()
+            taken += 1
+    except RateLimitWaitExceeded:
+        return taken
+
+
+class TestRateLimiter(TestBase):
+    """
+    Exercises the shared token bucket against a scratch state file
+    """
+    clsLogger: Logger = None
+
+    STATE_FILE_NAME: str = f'{gettempdir()}/TestRateLimiter.json'
+
+    @classmethod
+    def setUpClass(cls):
+        TestBase.setUpLogging()
+        TestRateLimiter.clsLogger = getLogger(__name__)
+
+    def setUp(self):
+        self.logger: Logger = TestRateLimiter.clsLogger
+        self._removeStateFile()
+
+    def tearDown(self):
+        self._removeStateFile()
+
+    def testBurstIsAvailableImmediately(self):
+
+        rateLimiter: RateLimiter = self._createRateLimiter(burstSize=3)
+        for x in range(3):
+            rateLimiter.acquire()
+
+    def testEmptyBucketRaisesAfterMaximumWait(self):
+
+        rateLimiter: RateLimiter = self._createRateLimiter(burstSize=1)
+        rateLimiter.acquire()
+
+        self.assertRaises(RateLimitWaitExceeded, rateLimiter.acquire)
+
+    def testBudgetIsSharedThroughStateFile(self):
+
+        firstLimiter:  RateLimiter = self._createRateLimiter(burstSize=1)
+        secondLimiter: RateLimiter = self._createRateLimiter(burstSize=1)
+        firstLimiter.acquire()
+
+        self.assertRaises(RateLimitWaitExceeded, secondLimiter.acquire)
+
+    def testRemainingHeaderClampsBucket(self):
+
+        rateLimiter: RateLimiter = self._createRateLimiter(burstSize=10)
+        rateLimiter.observeResponse(200, {RateLimiter.REMAINING_HEADER: '1'})
+        rateLimiter.acquire()
+
+        self.assertRaises(RateLimitWaitExceeded, rateLimiter.acquire)
+
+    def testRetryAfterBlocksBucket(self):
+
+        rateLimiter: RateLimiter = self._createRateLimiter(burstSize=10)
+        rateLimiter.observeResponse(RateLimiter.TOO_MANY_REQUESTS, {RateLimiter.RETRY_AFTER_HEADER: '30'})
+
+        self.assertRaises(RateLimitWaitExceeded, rateLimiter.acquire)
+
+    def testConcurrentProcessesNeverOverspend(self):
+
+        with Pool(processes=4) as pool:
+            taken = pool.map_async(drainBudget, [TestRateLimiter.STATE_FILE_NAME] * 4).get(timeout=30)
+
+        self.assertEqual(40, sum(taken), f'Tokens taken per process: {taken}')
+
+    def _createRateLimiter(self, burstSize: int) -> RateLimiter:
+        return RateLimiter(requestsPerMinute=1, burstSize=burstSize, maximumWait=0.1, stateFileName=TestRateLimiter.STATE_FILE_NAME)
+
+    def _removeStateFile(self):
+        if osPathExists(TestRateLimiter.STATE_FILE_NAME):
+            osRemove(TestRateLimiter.STATE_FILE_NAME)
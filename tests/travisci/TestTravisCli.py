@@ -0,0 +1,178 @@
+from logging import Logger
+from logging import getLogger
+
+from os import remove as osRemove
+from os.path import exists as osPathExists
+
+from tempfile import gettempdir
+
+from unittest import skipIf
+from unittest.mock import patch
+
+from tests.TestBase import TestBase
+
+from travisci.RateLimiter import RateLimiter
+
+from travisci.exceptions.RateLimitWaitExceeded import RateLimitWaitExceeded
+
+try:
+    from click.testing import CliRunner
+    from click.testing import Result
+    from requests import HTTPError
+    from requests import Session
+    from travisci.AccessPointResolver import AccessPointResolver
+    from travisci.BuildHistory import BuildHistory
+    from travisci.BuildWatcher import BuildWatcher
+    from travisci.TravisCli import TravisCli
+    from travisci.TravisCli import commandHandler
+    from travisci.TravisCli import mainHandler
+    from travisci.TravisCli import statsHandler
+except ImportError:     # The CLI dependencies are not installed
+    TravisCli = None
+
+
+class FakeResponse:
+    status_code: int  = 200
+    headers:     dict = {}
+
+
+@skipIf(TravisCli is None, 'click, PyTravisCI and requests are required')
+class TestTravisCli(TestBase):
+    """
+    Exercises the CLI paths that talk to Travis CI without reaching the network
+    """
+    clsLogger: Logger = None
+
+    STATE_FILE_NAME:   str = f'{gettempdir()}/TestTravisCli.json'
+    VERSION_FILE_NAME: str = f'{gettempdir()}/TestTravisCli-version.txt'
+    CACHE_FILE_NAME:   str = f'{gettempdir()}/TestTravisCli-endpoints.json'
+
+    @classmethod
+    def setUpClass(cls):
+        TestBase.setUpLogging()
+        TestTravisCli.clsLogger = getLogger(__name__)
+
+    def setUp(self):
+        self.logger: Logger = TestTravisCli.clsLogger
+        self._removeScratchFiles()
+
+    def tearDown(self):
+        self._removeScratchFiles()
+
+    def testTravisClientConsumesToken(self):
+
+        travisCmd: TravisCli = TravisCli()
+        travisCmd._rateLimiter = RateLimiter(requestsPerMinute=1, burstSize=1, maximumWait=0.1, stateFileName=TestTravisCli.STATE_FILE_NAME)
+
+        with patch.object(Session, 'request', return_value=FakeResponse()):
+            travisCI = travisCmd._createTravisCI(accessPoint='https://api.travis-ci.com')
+            session: Session = travisCI._TravisCI__requester.session
+            session.get('https://api.travis-ci.com/repo/hasii2011%2FPyUt')
+
+            self.assertRaises(RateLimitWaitExceeded, session.get, 'https://api.travis-ci.com/repo/hasii2011%2FPyUt')
+
+    def testWatchStampsPolledBuildWithoutRefetching(self):
+
+        with open(TestTravisCli.VERSION_FILE_NAME, 'w') as versionFile:
+            versionFile.write('1.2.3+.41')
+
+        travisCmd: TravisCli = TravisCli()
+        travisCmd._rateLimiter = RateLimiter(requestsPerMinute=60, burstSize=10, maximumWait=0.1, stateFileName=TestTravisCli.STATE_FILE_NAME)
+        travisCmd.repoSlugName = 'hasii2011/PyUt'
+        travisCmd.versionFile  = TestTravisCli.VERSION_FILE_NAME
+        travisCmd.majorVersion = None
+        travisCmd.minorVersion = None
+        travisCmd.patchVersion = None
+
+        with patch.object(BuildWatcher, '_fetchLatestBuild', return_value=('42', 'passed')), \
+                patch.object(Session, 'request') as mockRequest, \
+                patch('travisci.TravisCli.sleep', side_effect=KeyboardInterrupt):
+            self.assertRaises(KeyboardInterrupt, travisCmd.watchCommand)
+            mockRequest.assert_not_called()
+
+        with open(TestTravisCli.VERSION_FILE_NAME, 'r') as versionFile:
+            self.assertEqual('1.2.3+.42', versionFile.read())
+
+    def testWatchIntervalMustBePositive(self):
+
+        runner: CliRunner = CliRunner()
+        result: Result    = runner.invoke(commandHandler, ['-r', 'hasii2011/PyUt', '-f', __file__, '--watch', '--watch-interval', '0'])
+
+        self.assertEqual(2, result.exit_code)
+
+    def testStatsReportsDamagedSnapshot(self):
+
+        with open(TestTravisCli.VERSION_FILE_NAME, 'w') as notASnapshot:
+            notASnapshot.write('1.2.3+.41')
+
+        runner: CliRunner = CliRunner()
+        result: Result    = runner.invoke(statsHandler, ['-r', 'hasii2011/PyUt', '-s', TestTravisCli.VERSION_FILE_NAME])
+
+        self.assertEqual(1, result.exit_code)
+        self.assertIn('is not a build history snapshot', result.output)
+
+    def testStatsRejectsSnapshotOfOtherRepository(self):
+
+        buildHistory: BuildHistory = BuildHistory()
+        buildHistory.repoSlugName = 'hasii2011/traviscli'
+        buildHistory.save(TestTravisCli.VERSION_FILE_NAME)
+
+        runner: CliRunner = CliRunner()
+        result: Result    = runner.invoke(statsHandler, ['-r', 'hasii2011/PyUt', '-s', TestTravisCli.VERSION_FILE_NAME])
+
+        self.assertEqual(1, result.exit_code)
+        self.assertIn('holds the build history of hasii2011/traviscli', result.output)
+
+    def testStatsWindowMustNotBeNegative(self):
+
+        runner: CliRunner = CliRunner()
+        result: Result    = runner.invoke(statsHandler, ['-r', 'hasii2011/PyUt', '-w', '-7'])
+
+        self.assertEqual(2, result.exit_code)
+
+    def testHelpListsEveryCommand(self):
+
+        runner: CliRunner = CliRunner()
+        for args in (['--help'], []):
+            result: Result = runner.invoke(mainHandler, args)
+            self.assertIn('update', result.output)
+            self.assertIn('stats', result.output)
+
+    def testMovedRepositoryIsProbedAgain(self):
+
+        with open(TestTravisCli.CACHE_FILE_NAME, 'w') as cacheFile:
+            cacheFile.write('{"hasii2011/PyUt": "https://api.travis-ci.org"}')
+
+        travisCmd: TravisCli = TravisCli()
+        travisCmd.repoSlugName = 'hasii2011/PyUt'
+        travisCmd.accessPoint  = TravisCli.ACCESS_POINT_AUTO
+        travisCmd._accessPointResolver = AccessPointResolver(candidates=('https://api.travis-ci.com', 'https://api.travis-ci.org'),
+                                                             sessionFactory=travisCmd._createApiSession,
+                                                             cacheFileName=TestTravisCli.CACHE_FILE_NAME)
+        usedAccessPoints = []
+
+        def operation(accessPoint: str) -> str:
+            usedAccessPoints.append(accessPoint)
+            if accessPoint == 'https://api.travis-ci.org':
+                notFound: FakeResponse = FakeResponse()
+                notFound.status_code = 404
+                raise HTTPError(response=notFound)
+            return accessPoint
+
+        def probe(resolver, accessPoint: str, repoSlugName: str) -> int:
+            return 200 if accessPoint == 'https://api.travis-ci.com' else 404
+
+        with patch.object(AccessPointResolver, '_probeStatus', probe):
+            self.assertEqual('https://api.travis-ci.com', travisCmd._withAccessPoint(operation))
+
+        self.assertEqual(['https://api.travis-ci.org', 'https://api.travis-ci.com'], usedAccessPoints)
+        with open(TestTravisCli.CACHE_FILE_NAME, 'r') as cacheFile:
+            self.assertIn('https://api.travis-ci.com', cacheFile.read())
+
+    def _removeScratchFiles(self):
+        if osPathExists(TestTravisCli.STATE_FILE_NAME):
+            osRemove(TestTravisCli.STATE_FILE_NAME)
+        if osPathExists(TestTravisCli.VERSION_FILE_NAME):
+            osRemove(TestTravisCli.VERSION_FILE_NAME)
+        if osPathExists(TestTravisCli.CACHE_FILE_NAME):
+            osRemove(TestTravisCli.CACHE_FILE_NAME)
@@ -0,0 +1,174 @@
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from logging import Logger
+from logging import getLogger
+
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+
+from json import JSONDecodeError
+from json import dumps as jsonDumps
+from json import loads as jsonLoads
+
+from os import replace as osReplace
+from os import sep as osSep
+from os.path import dirname
+
+from requests import HTTPError
+from requests import RequestException
+from requests import Response
+
+from travisci.Preferences import Preferences
+from travisci.TravisApiSession import TravisApiSession
+
+from travisci.exceptions.AccessPointNotFound import AccessPointNotFound
+from travisci.exceptions.ApiTokenRejected import ApiTokenRejected
+from travisci.exceptions.RateLimitWaitExceeded import RateLimitWaitExceeded
+
+SessionFactory = Callable[[str], TravisApiSession]
+
+
+class AccessPointResolver:
+    """
+    Finds the Travis CI end point that hosts a repository.  The candidate end points are
+    probed concurrently and the first one that knows the repository wins.  The answer is
+    remembered per repository slug in a small file next to the preferences file, so later
+    runs go straight to the right end point.
+    """
+    CACHE_FILE_NAME: str = '.travisci-cli-endpoints.json'
+
+    AUTHORIZATION_FAILURES: Tuple[int, ...] = (401, 403)
+    NOT_FOUND:              int             = 404
+
+    def __init__(self, candidates: Tuple[str, ...], sessionFactory: SessionFactory, cacheFileName: str = None):
+        """
+
+        Args:
+            candidates:     The Travis CI API end points to probe
+            sessionFactory: Creates a rate limited session for an end point
+            cacheFileName:  Fully qualified name of the cache file;  Defaults to a file in the
+                            same directory as the preferences file
+        """
+        self.logger: Logger = getLogger(__name__)
+
+        self._candidates:     Tuple[str, ...] = candidates
+        self._sessionFactory: SessionFactory  = sessionFactory
+
+        if cacheFileName is None:
+            cacheFileName = AccessPointResolver.determineCacheLocation()
+        self._cacheFileName: str = cacheFileName
+
+    @staticmethod
+    def determineCacheLocation() -> str:
+        """
+        Returns:  The fully qualified cache file name
+        """
+        preferencesDirectory: str = dirname(Preferences.getPreferencesLocation())
+        if preferencesDirectory == '':
+            return AccessPointResolver.CACHE_FILE_NAME
+        else:
+            return f'{preferencesDirectory}{osSep}{AccessPointResolver.CACHE_FILE_NAME}'
+
+    def resolve(self, repoSlugName: str) -> str:
+        """
+        Args:
+            repoSlugName:  something thing like hasii2011/PyUt
+
+        Returns:  The end point that hosts the repository
+
+        Raises:
+            AccessPointNotFound if every candidate end point answered that it does not know the repository
+            ApiTokenRejected if no candidate end point accepted the API token
+            RequestException or RateLimitWaitExceeded if a candidate end point could not be asked;  The
+            repository may well live there, so this is not reported as not found
+        """
+        cache: Dict[str, str] = self._readCache()
+        if cache.get(repoSlugName) in self._candidates:
+            return cache[repoSlugName]
+
+        accessPoint: str = self._probe(repoSlugName)
+        self.logger.info(f'{repoSlugName} is hosted at {accessPoint}')
+
+        cache[repoSlugName] = accessPoint
+        self._writeCache(cache)
+
+        return accessPoint
+
+    def forget(self, repoSlugName: str):
+        """
+        Drop a remembered end point after the repository was not found there
+
+        Args:
+            repoSlugName:  something thing like hasii2011/PyUt
+        """
+        cache: Dict[str, str] = self._readCache()
+        if cache.pop(repoSlugName, None) is not None:
+            self._writeCache(cache)
+
+    def _probe(self, repoSlugName: str) -> str:
+
+        executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=len(self._candidates))
+        rejected: List[str]          = []
+        failures: List[Exception]    = []
+        try:
+            probes: Dict[Future, str] = {executor.submit(self._probeStatus, accessPoint, repoSlugName): accessPoint for accessPoint in self._candidates}
+            for probe in as_completed(probes):
+                accessPoint: str = probes[probe]
+                try:
+                    statusCode: int = probe.result()
+                except (RequestException, RateLimitWaitExceeded) as e:
+                    self.logger.warning(f'Unable to probe {accessPoint}: {e}')
+                    failures.append(e)
+                    continue
+                if 200 <= statusCode < 300:
+                    return accessPoint
+                if statusCode in AccessPointResolver.AUTHORIZATION_FAILURES:
+                    rejected.append(accessPoint)
+                elif statusCode != AccessPointResolver.NOT_FOUND:
+                    failures.append(HTTPError(f'{accessPoint} answered {statusCode} for {repoSlugName}'))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if len(failures) > 0:
+            raise failures[0]
+        if len(rejected) > 0:
+            raise ApiTokenRejected(f'{", ".join(rejected)} rejected the API token;  Check travisci_api_token in {Preferences.getPreferencesLocation()}')
+        raise AccessPointNotFound(f'None of {", ".join(self._candidates)} hosts {repoSlugName}')
+
+    def _probeStatus(self, accessPoint: str, repoSlugName: str) -> int:
+        """
+        Returns:  The HTTP status of the repository request
+
+        Raises:  RequestException or RateLimitWaitExceeded if the request failed
+        """
+        apiSession: TravisApiSession = self._sessionFactory(accessPoint)
+        try:
+            response: Response = apiSession.get(apiSession.repositoryUrl(repoSlugName), timeout=30)
+            self.logger.debug(f'{accessPoint}: {response.status_code}')
+            return response.status_code
+        finally:
+            apiSession.close()
+
+    def _readCache(self) -> Dict[str, str]:
+
+        try:
+            with open(self._cacheFileName, 'r') as cacheFile:
+                return jsonLoads(cacheFile.read())
+        except (OSError, JSONDecodeError):
+            return {}
+
+    def _writeCache(self, cache: Dict[str, str]):
+        """
+        Write to a scratch file and rename it so concurrent readers never see a partial file
+        """
+        scratchFileName: str = f'{self._cacheFileName}.tmp'
+        try:
+            with open(scratchFileName, 'w') as scratchFile:
+                scratchFile.write(jsonDumps(cache, indent=4))
+            osReplace(scratchFileName, self._cacheFileName)
+        except OSError as e:
+            self.logger.warning(f'Unable to remember access point: {e}')
@@ -0,0 +1,249 @@
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import cast
+
+from logging import Logger
+from logging import getLogger
+
+from array import array
+
+from datetime import datetime
+
+from json import dumps as jsonDumps
+from json import loads as jsonLoads
+
+from math import nan
+
+from sys import byteorder
+
+from requests import Response
+
+from travisci.TravisApiSession import TravisApiSession
+
+
+class BuildHistoryError(Exception):
+    pass
+
+
+class BuildHistory:
+    """
+    The build history of a repository kept as parallel compact columns instead of resource
+    objects.  A build costs roughly 20 bytes, so tens of thousands of builds fit comfortably
+    in memory.
+
+    Missing durations are stored as -1 and missing start times as NaN.  States and branch
+    names are stored as small indices into lookup tables.  A history remembers the repository
+    and end point it was fetched from, so a snapshot is never extended with another repository's builds.
+    """
+    SNAPSHOT_MAGIC:   bytes = b'TRAVISCLI-BUILDS'
+    SNAPSHOT_VERSION: int   = 2
+
+    NO_DURATION: int = -1
+
+    STATES:       Tuple[str, ...] = ('created', 'received', 'queued', 'started', 'passed', 'failed', 'errored', 'canceled')
+    FINAL_STATES: Tuple[str, ...] = ('passed', 'failed', 'errored', 'canceled')
+    UNKNOWN_STATE: str            = 'unknown'
+
+    def __init__(self):
+
+        self.logger: Logger = getLogger(__name__)
+
+        self.numbers:   array = array('i')
+        self.states:    array = array('B')
+        self.durations: array = array('i')
+        self.startedAt: array = array('d')
+        self.branches:  array = array('H')
+
+        self.repoSlugName: str = cast(str, None)
+        self.accessPoint:  str = cast(str, None)
+
+        self.stateNames:  List[str]      = list(BuildHistory.STATES) + [BuildHistory.UNKNOWN_STATE]
+        self.branchNames: List[str]      = []
+        self._branchIds:  Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    @property
+    def resumeNumber(self) -> int:
+        """
+        The build number an incremental fetch must reach back to.  Builds that were still in
+        flight when the history was captured are fetched again so their final state is recorded.
+
+        Returns:  The oldest unfinished build number, else the newest build number;  0 when empty
+        """
+        if len(self.numbers) == 0:
+            return 0
+        finalStates = {self.stateNames.index(state) for state in BuildHistory.FINAL_STATES}
+        unfinished: List[int] = [number for number, state in zip(self.numbers, self.states) if state not in finalStates]
+        if len(unfinished) == 0:
+            return max(self.numbers)
+        else:
+            return min(unfinished)
+
+    def append(self, number: int, state: str, duration: int, startedAt: float, branch: str):
+        """
+        Args:
+            number:     The build number
+            state:      The Travis CI build state
+            duration:   The build duration in seconds;  None if not known
+            startedAt:  The build start as a POSIX timestamp;  None if the build never started
+            branch:     The branch name
+        """
+        if state not in self.stateNames:
+            state = BuildHistory.UNKNOWN_STATE
+        if branch not in self._branchIds:
+            self._branchIds[branch] = len(self.branchNames)
+            self.branchNames.append(branch)
+
+        self.numbers.append(number)
+        self.states.append(self.stateNames.index(state))
+        self.durations.append(BuildHistory.NO_DURATION if duration is None else duration)
+        self.startedAt.append(nan if startedAt is None else startedAt)
+        self.branches.append(self._branchIds[branch])
+
+    def discardFrom(self, number: int):
+        """
+        Drop every build whose number is greater than or equal to the input one
+
+        Args:
+            number: The first build number to drop
+        """
+        keep: List[int] = [idx for idx, buildNumber in enumerate(self.numbers) if buildNumber < number]
+
+        self.numbers   = array(self.numbers.typecode,   (self.numbers[idx]   for idx in keep))
+        self.states    = array(self.states.typecode,    (self.states[idx]    for idx in keep))
+        self.durations = array(self.durations.typecode, (self.durations[idx] for idx in keep))
+        self.startedAt = array(self.startedAt.typecode, (self.startedAt[idx] for idx in keep))
+        self.branches  = array(self.branches.typecode,  (self.branches[idx]  for idx in keep))
+
+    def fetchNewer(self, apiSession: TravisApiSession, repoSlugName: str, pageSize: int = 100) -> int:
+        """
+        Stream the repository's builds, newest first, page by page until reaching the builds
+        already in this history.  Only the compact columns of each page are kept.  Builds that
+        start while paging push earlier builds onto the next page;  Those repeats are skipped.
+
+        Args:
+            apiSession:     The rate limited Travis CI session
+            repoSlugName:   something thing like hasii2011/PyUt
+            pageSize:       The number of builds to request per page
+
+        Returns:  The number of builds added
+
+        Raises:  BuildHistoryError if the history was fetched from another repository or end point
+        """
+        if self.repoSlugName is not None and self.repoSlugName != repoSlugName:
+            raise BuildHistoryError(f'The build history is of {self.repoSlugName}, not {repoSlugName}')
+        if self.accessPoint is not None and self.accessPoint != apiSession.accessPoint:
+            raise BuildHistoryError(f'The build history was fetched from {self.accessPoint}, not {apiSession.accessPoint}')
+        self.repoSlugName = repoSlugName
+        self.accessPoint  = apiSession.accessPoint
+
+        resumeNumber: int = self.resumeNumber
+        self.discardFrom(resumeNumber)
+
+        buildsUrl:    str = apiSession.buildsUrl(repoSlugName)
+        offset:       int = 0
+        added:        int = 0
+        lowestNumber: int = cast(int, None)
+        while True:
+            response: Response = apiSession.get(buildsUrl, params={'limit': pageSize, 'offset': offset, 'sort_by': 'number:desc'}, timeout=60)
+            response.raise_for_status()
+            page = response.json()
+
+            builds = page.get('builds', [])
+            for build in builds:
+                number: int = int(build['number'])
+                if number < resumeNumber:
+                    return added
+                # Builds that arrive while paging shift later pages;  Skip the ones already seen
+                if lowestNumber is not None and number >= lowestNumber:
+                    continue
+                lowestNumber = number
+                self.append(number=number,
+                            state=build.get('state'),
+                            duration=build.get('duration'),
+                            startedAt=self._toTimestamp(build.get('started_at')),
+                            branch=(build.get('branch') or {}).get('name', ''))
+                added += 1
+
+            self.logger.info(f'Fetched {offset + len(builds)} builds')
+            if len(builds) == 0 or page.get('@pagination', {}).get('is_last', True) is True:
+                return added
+            offset += len(builds)
+
+    def save(self, fileName: str):
+        """
+        Write a compact binary snapshot:  A JSON header line followed by the raw column bytes
+
+        Args:
+            fileName:  The snapshot file name
+        """
+        columns: List[array] = self._columns()
+        header = {
+            'version':      BuildHistory.SNAPSHOT_VERSION,
+            'repoSlugName': self.repoSlugName,
+            'accessPoint':  self.accessPoint,
+            'byteorder':    byteorder,
+            'count':        len(self.numbers),
+            'typecodes':    [column.typecode for column in columns],
+            'itemsizes':    [column.itemsize for column in columns],
+            'stateNames':   self.stateNames,
+            'branchNames':  self.branchNames,
+        }
+        with open(fileName, 'wb') as snapshotFile:
+            snapshotFile.write(BuildHistory.SNAPSHOT_MAGIC + b'\n')
+            snapshotFile.write(jsonDumps(header).encode('utf-8') + b'\n')
+            for column in columns:
+                column.tofile(snapshotFile)
+
+    @classmethod
+    def load(cls, fileName: str, repoSlugName: str = None) -> 'BuildHistory':
+        """
+        Args:
+            fileName:       A snapshot file written by save()
+            repoSlugName:   The repository the snapshot must belong to;  None accepts any repository
+
+        Returns:  The build history stored in the snapshot
+
+        Raises:  BuildHistoryError if the file is not a usable snapshot or belongs to another repository
+        """
+        buildHistory: BuildHistory = cls()
+        with open(fileName, 'rb') as snapshotFile:
+            if snapshotFile.readline().rstrip(b'\n') != BuildHistory.SNAPSHOT_MAGIC:
+                raise BuildHistoryError(f'{fileName} is not a build history snapshot')
+            try:
+                header = jsonLoads(snapshotFile.readline())
+                if header['version'] != BuildHistory.SNAPSHOT_VERSION:
+                    raise BuildHistoryError(f'Unsupported snapshot version: {header["version"]}')
+                if repoSlugName is not None and header['repoSlugName'] != repoSlugName:
+                    raise BuildHistoryError(f'{fileName} holds the build history of {header["repoSlugName"]}, not {repoSlugName}')
+
+                columns: List[array] = buildHistory._columns()
+                if header['itemsizes'] != [column.itemsize for column in columns]:
+                    raise BuildHistoryError(f'{fileName} was written on an incompatible platform')
+                for column in columns:
+                    column.fromfile(snapshotFile, header['count'])
+                    if header['byteorder'] != byteorder:
+                        column.byteswap()
+
+                buildHistory.repoSlugName = header['repoSlugName']
+                buildHistory.accessPoint  = header['accessPoint']
+                buildHistory.stateNames   = header['stateNames']
+                buildHistory.branchNames  = header['branchNames']
+            except (ValueError, KeyError, TypeError, EOFError) as e:
+                raise BuildHistoryError(f'{fileName} is a damaged build history snapshot: {e}') from e
+
+        buildHistory._branchIds = {name: idx for idx, name in enumerate(buildHistory.branchNames)}
+
+        return buildHistory
+
+    def _columns(self) -> List[array]:
+        return [self.numbers, self.states, self.durations, self.startedAt, self.branches]
+
+    def _toTimestamp(self, isoDate: str) -> float:
+
+        if isoDate is None:
+            return nan
+        return datetime.fromisoformat(isoDate.replace('Z', '+00:00')).timestamp()
@@ -0,0 +1,129 @@
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Tuple
+
+from logging import Logger
+from logging import getLogger
+
+from math import ceil
+from math import isnan
+
+from time import time
+
+from travisci.BuildHistory import BuildHistory
+
+ALL_BRANCHES: str = '(all branches)'
+
+SECONDS_PER_DAY: int = 24 * 60 * 60
+
+
+class WindowStatistics(NamedTuple):
+    """
+    The statistics of one branch over one window of days;  windowDays is 0 for the full history
+    """
+    branch:       str
+    windowDays:   int
+    buildCount:   int
+    successRate:  float
+    p50Duration:  float
+    p90Duration:  float
+    p95Duration:  float
+    buildsPerDay: float
+
+
+class BuildStatistics:
+    """
+    Computes success rates, duration percentiles and throughput per branch from a build history
+    """
+    SUCCESS_STATE:   str             = 'passed'
+    DECIDING_STATES: Tuple[str, ...] = ('passed', 'failed', 'errored')
+
+    def __init__(self, buildHistory: BuildHistory):
+
+        self.logger: Logger = getLogger(__name__)
+
+        self._buildHistory: BuildHistory = buildHistory
+
+    def compute(self, windowDays: Tuple[int, ...], topBranches: int, now: float = None) -> List[WindowStatistics]:
+        """
+        Args:
+            windowDays:     The windows to report, in days;  0 means the full history
+            topBranches:    Report only this many of the busiest branches besides the overall numbers
+            now:            The end of every window as a POSIX timestamp;  Defaults to the current time
+
+        Returns:  The statistics for all branches followed by the busiest branches, per window
+        """
+        if now is None:
+            now = time()
+
+        buildHistory: BuildHistory = self._buildHistory
+
+        branchCounts: Dict[int, int] = {}
+        for branchId in buildHistory.branches:
+            branchCounts[branchId] = branchCounts.get(branchId, 0) + 1
+        busiest: List[int] = sorted(branchCounts, key=lambda branchId: branchCounts[branchId], reverse=True)[:topBranches]
+
+        successState:   int = buildHistory.stateNames.index(BuildStatistics.SUCCESS_STATE)
+        decidingStates: set = {buildHistory.stateNames.index(state) for state in BuildStatistics.DECIDING_STATES}
+
+        results: List[WindowStatistics] = []
+        for days in windowDays:
+            windowStart: float = now - days * SECONDS_PER_DAY
+
+            groups: Dict[int, List[int]] = {branchId: [] for branchId in busiest}
+            everything: List[int] = []
+            for idx, startedAt in enumerate(buildHistory.startedAt):
+                if days == 0 or (not isnan(startedAt) and windowStart <= startedAt <= now):
+                    everything.append(idx)
+                    branchId: int = buildHistory.branches[idx]
+                    if branchId in groups:
+                        groups[branchId].append(idx)
+
+            results.append(self._summarize(ALL_BRANCHES, days, everything, successState, decidingStates, now))
+            for branchId in busiest:
+                results.append(self._summarize(buildHistory.branchNames[branchId], days, groups[branchId], successState, decidingStates, now))
+
+        return results
+
+    def _summarize(self, branch: str, days: int, indices: List[int], successState: int, decidingStates: set, now: float) -> WindowStatistics:
+
+        buildHistory: BuildHistory = self._buildHistory
+
+        decided:   int       = 0
+        succeeded: int       = 0
+        durations: List[int] = []
+        earliest:  float     = now
+        for idx in indices:
+            state: int = buildHistory.states[idx]
+            if state in decidingStates:
+                decided += 1
+                if state == successState:
+                    succeeded += 1
+            if buildHistory.durations[idx] != BuildHistory.NO_DURATION:
+                durations.append(buildHistory.durations[idx])
+            if not isnan(buildHistory.startedAt[idx]):
+                earliest = min(earliest, buildHistory.startedAt[idx])
+        durations.sort()
+
+        spanDays: float = days if days != 0 else max((now - earliest) / SECONDS_PER_DAY, 1.0)
+
+        return WindowStatistics(branch=branch,
+                                windowDays=days,
+                                buildCount=len(indices),
+                                successRate=succeeded / decided if decided > 0 else float('nan'),
+                                p50Duration=self._percentile(durations, 50),
+                                p90Duration=self._percentile(durations, 90),
+                                p95Duration=self._percentile(durations, 95),
+                                buildsPerDay=len(indices) / spanDays)
+
+    def _percentile(self, sortedValues: List[int], percent: int) -> float:
+        """
+        Nearest rank percentile
+
+        Returns:  NaN when there are no values
+        """
+        if len(sortedValues) == 0:
+            return float('nan')
+        rank: int = max(ceil(percent / 100 * len(sortedValues)), 1)
+        return float(sortedValues[rank - 1])
@@ -0,0 +1,124 @@
+from typing import Dict
+from typing import Tuple
+from typing import cast
+
+from logging import Logger
+from logging import getLogger
+
+from requests import RequestException
+from requests import Response
+
+from travisci.TravisApiSession import TravisApiSession
+
+from travisci.exceptions.RateLimitWaitExceeded import RateLimitWaitExceeded
+
+LatestBuild = Tuple[str, str]   # (build number, build state)
+
+
+class BuildWatcher:
+    """
+    Cheaply polls Travis CI for the newest build of a repository.
+
+    Each poll is a single conditional request for one build;  When Travis CI says nothing
+    changed (304) the poll costs no parsing at all.  The poll interval is adaptive:  It stays
+    at the minimum while a build is in flight or right after a new build appears, then
+    doubles on every quiet poll up to the maximum.
+    """
+    NOT_MODIFIED: int = 304
+
+    ACTIVE_STATES: Tuple[str, ...] = ('created', 'received', 'queued', 'started')
+
+    def __init__(self, apiSession: TravisApiSession, repoSlugName: str, minimumInterval: float, maximumInterval: float):
+        """
+
+        Args:
+            apiSession:         The rate limited Travis CI session to poll with
+            repoSlugName:       something thing like hasii2011/PyUt
+            minimumInterval:    Fastest poll interval in seconds
+            maximumInterval:    Slowest poll interval in seconds
+        """
+        self.logger: Logger = getLogger(__name__)
+
+        self._session:   TravisApiSession = apiSession
+        self._buildsUrl: str              = apiSession.buildsUrl(repoSlugName)
+
+        self._minimumInterval: float = minimumInterval
+        self._maximumInterval: float = max(maximumInterval, minimumInterval)
+        self._interval:        float = minimumInterval
+
+        self._validators:  Dict[str, str] = {}
+        self._latestBuild: LatestBuild    = cast(LatestBuild, None)
+
+    @property
+    def interval(self) -> float:
+        """
+        The number of seconds to wait before the next poll
+        """
+        return self._interval
+
+    @property
+    def latestBuild(self) -> LatestBuild:
+        """
+        The newest (build number, build state) seen so far
+        """
+        return self._latestBuild
+
+    def start(self) -> LatestBuild:
+        """
+        The first poll.  Unlike poll() a failure is raised, so a wrong end point or repository
+        surfaces immediately instead of being retried for days.
+
+        Returns:  The newest (build number, build state);  None if the repository has no builds
+        """
+        self._latestBuild = self._fetchLatestBuild()
+        self._interval    = self._minimumInterval
+
+        return self._latestBuild
+
+    def poll(self) -> LatestBuild:
+        """
+        Ask Travis CI for the newest build and adjust the poll interval
+
+        Returns:  The newest (build number, build state);  The previous answer when nothing changed or
+        the request failed;  None if Travis CI has not answered yet
+        """
+        previousBuild: LatestBuild = self._latestBuild
+        try:
+            self._latestBuild = self._fetchLatestBuild()
+        except (RequestException, RateLimitWaitExceeded, ValueError) as e:
+            self.logger.warning(f'Poll failed: {e}')
+
+        self._interval = self._nextInterval(previousBuild=previousBuild, latestBuild=self._latestBuild)
+
+        return self._latestBuild
+
+    def close(self):
+        self._session.close()
+
+    def _fetchLatestBuild(self) -> LatestBuild:
+
+        response: Response = self._session.get(self._buildsUrl, params={'limit': 1}, headers=self._validators, timeout=30)
+        if response.status_code == BuildWatcher.NOT_MODIFIED:
+            return self._latestBuild
+        response.raise_for_status()
+
+        self._validators = {}
+        if 'ETag' in response.headers:
+            self._validators['If-None-Match'] = response.headers['ETag']
+        if 'Last-Modified' in response.headers:
+            self._validators['If-Modified-Since'] = response.headers['Last-Modified']
+
+        builds = response.json().get('builds', [])
+        if len(builds) == 0:
+            return self._latestBuild
+
+        return str(builds[0]['number']), str(builds[0]['state'])
+
+    def _nextInterval(self, previousBuild: LatestBuild, latestBuild: LatestBuild) -> float:
+        """
+        Poll fast when something is happening;  Back off exponentially when idle
+        """
+        if latestBuild is not None and (latestBuild != previousBuild or latestBuild[1] in BuildWatcher.ACTIVE_STATES):
+            return self._minimumInterval
+        else:
+            return min(self._interval * 2, self._maximumInterval)
@@ -0,0 +1,25 @@
+from typing import List
+
+from click import Context
+from click import Group
+
+
+class DefaultCommandGroup(Group):
+    """
+    A command group that runs its default command when the first argument does not name a
+    subcommand.  This keeps `traviscli -r hasii2011/PyUt` working alongside `traviscli stats`.
+    No arguments or a bare help option still reach the group, so its help lists every subcommand.
+    """
+    def __init__(self, defaultCommandName: str, *args, **kwargs):
+
+        super().__init__(*args, **kwargs)
+        self._defaultCommandName: str = defaultCommandName
+
+    def parse_args(self, ctx: Context, args: List[str]) -> List[str]:
+
+        if len(args) == 0 or args[0] in self.get_help_option_names(ctx):
+            return super().parse_args(ctx, args)
+        if args[0] not in self.commands:
+            args.insert(0, self._defaultCommandName)
+
+        return super().parse_args(ctx, args)
@@ -22,6 +22,9 @@ class Preferences(Singleton):
     TRAVIS_CI_SECTION:      str = 'TRAVISCI'
 
     TRAVISCI_API_TOKEN_KEY:  str = 'travisci_api_token'
+    API_REQUESTS_PER_MINUTE: str = 'api_requests_per_minute'
+    API_BURST_SIZE:          str = 'api_burst_size'
+    API_MAXIMUM_WAIT:        str = 'api_maximum_wait'
 
     preferencesFileLocationAndName: str = None
 
@@ -59,6 +62,36 @@ class Preferences(Singleton):
         self._config.set(Preferences.TRAVIS_CI_SECTION, Preferences.TRAVISCI_API_TOKEN_KEY, newValue)
         self.__saveConfig()
 
+    @property
+    def apiRequestsPerMinute(self) -> int:
+        return self._config.getint(Preferences.TRAVIS_CI_SECTION, Preferences.API_REQUESTS_PER_MINUTE)
+
+    @apiRequestsPerMinute.setter
+    def apiRequestsPerMinute(self, newValue: int):
+        self._config.set(Preferences.TRAVIS_CI_SECTION, Preferences.API_REQUESTS_PER_MINUTE, str(newValue))
+        self.__saveConfig()
+
+    @property
+    def apiBurstSize(self) -> int:
+        return self._config.getint(Preferences.TRAVIS_CI_SECTION, Preferences.API_BURST_SIZE)
+
+    @apiBurstSize.setter
+    def apiBurstSize(self, newValue: int):
+        self._config.set(Preferences.TRAVIS_CI_SECTION, Preferences.API_BURST_SIZE, str(newValue))
+        self.__saveConfig()
+
+    @property
+    def apiMaximumWait(self) -> float:
+        """
+        The number of seconds a process queues for an API request slot before giving up
+        """
+        return self._config.getfloat(Preferences.TRAVIS_CI_SECTION, Preferences.API_MAXIMUM_WAIT)
+
+    @apiMaximumWait.setter
+    def apiMaximumWait(self, newValue: float):
+        self._config.set(Preferences.TRAVIS_CI_SECTION, Preferences.API_MAXIMUM_WAIT, str(newValue))
+        self.__saveConfig()
+
     def _loadConfiguration(self):
         """
         Load preferences from configuration file
@@ -100,6 +133,12 @@ class Preferences(Singleton):
 
         if self._config.has_option(Preferences.TRAVIS_CI_SECTION, Preferences.TRAVISCI_API_TOKEN_KEY) is False:
             self._config.set(Preferences.TRAVIS_CI_SECTION, Preferences.TRAVISCI_API_TOKEN_KEY, 'PutYourTravisCIKeyHere')
+        if self._config.has_option(Preferences.TRAVIS_CI_SECTION, Preferences.API_REQUESTS_PER_MINUTE) is False:
+            self._config.set(Preferences.TRAVIS_CI_SECTION, Preferences.API_REQUESTS_PER_MINUTE, '60')
+        if self._config.has_option(Preferences.TRAVIS_CI_SECTION, Preferences.API_BURST_SIZE) is False:
+            self._config.set(Preferences.TRAVIS_CI_SECTION, Preferences.API_BURST_SIZE, '10')
+        if self._config.has_option(Preferences.TRAVIS_CI_SECTION, Preferences.API_MAXIMUM_WAIT) is False:
+            self._config.set(Preferences.TRAVIS_CI_SECTION, Preferences.API_MAXIMUM_WAIT, '60.0')
 
     def __saveConfig(self):
         """
@@ -0,0 +1,245 @@
+from typing import Callable
+from typing import Dict
+from typing import Mapping
+from typing import TextIO
+from typing import cast
+
+from logging import Logger
+from logging import getLogger
+
+from json import JSONDecodeError
+from json import dumps as jsonDumps
+from json import loads as jsonLoads
+
+from os import sep as osSep
+from os.path import dirname
+
+from time import sleep
+from time import time
+
+from travisci.Preferences import Preferences
+
+from travisci.exceptions.RateLimitWaitExceeded import RateLimitWaitExceeded
+
+try:
+    from fcntl import flock
+    from fcntl import LOCK_EX
+    from fcntl import LOCK_UN
+
+    def lockStateFile(stateFile: TextIO):
+        flock(stateFile.fileno(), LOCK_EX)
+
+    def unlockStateFile(stateFile: TextIO):
+        flock(stateFile.fileno(), LOCK_UN)
+
+except ImportError:     # Windows has no flock;  Lock the first byte of the state file instead
+    from msvcrt import locking
+    from msvcrt import LK_LOCK
+    from msvcrt import LK_UNLCK
+
+    def lockStateFile(stateFile: TextIO):
+        stateFile.seek(0)
+        while True:
+            try:
+                locking(stateFile.fileno(), LK_LOCK, 1)
+                return
+            except OSError:     # LK_LOCK gives up after 10 attempts;  Keep waiting for the holder
+                pass
+
+    def unlockStateFile(stateFile: TextIO):
+        stateFile.seek(0)
+        locking(stateFile.fileno(), LK_UNLCK, 1)
+
+
+class RateLimiter:
+    """
+    A token bucket whose state lives in a small file next to the preferences file.  Every
+    traviscli process on a host locks that file to draw from the same API request budget.
+
+    A process that finds the bucket empty sleeps until a token is available instead of
+    firing a request that Travis CI will refuse.  The rate limit headers in Travis CI
+    responses feed back into the bucket, so the local budget never claims more requests
+    than the server says are left.
+    """
+    STATE_FILE_NAME: str = '.travisci-cli-ratelimit.json'
+
+    REMAINING_HEADER:   str = 'X-RateLimit-Remaining'
+    RESET_HEADER:       str = 'X-RateLimit-Reset'
+    RETRY_AFTER_HEADER: str = 'Retry-After'
+
+    TOO_MANY_REQUESTS: int = 429
+
+    TOKENS_KEY:        str = 'tokens'
+    LAST_REFILL_KEY:   str = 'lastRefill'
+    BLOCKED_UNTIL_KEY: str = 'blockedUntil'
+
+    def __init__(self, requestsPerMinute: int, burstSize: int, maximumWait: float, stateFileName: str = None):
+        """
+
+        Args:
+            requestsPerMinute:  The sustained rate at which the bucket refills
+            burstSize:          The bucket capacity
+            maximumWait:        The number of seconds acquire() queues before giving up
+            stateFileName:      Fully qualified name of the shared state file;  Defaults to a file
+                                in the same directory as the preferences file
+        """
+        self.logger: Logger = getLogger(__name__)
+
+        self._refillRate:  float = max(requestsPerMinute, 1) / 60.0
+        self._capacity:    float = float(max(burstSize, 1))
+        self._maximumWait: float = maximumWait
+
+        if stateFileName is None:
+            stateFileName = RateLimiter.determineStateLocation()
+        self._stateFileName: str = stateFileName
+
+    @staticmethod
+    def determineStateLocation() -> str:
+        """
+        The shared state lives beside the preferences file so all processes for a user find it
+
+        Returns:  The fully qualified state file name
+        """
+        preferencesDirectory: str = dirname(Preferences.getPreferencesLocation())
+        if preferencesDirectory == '':
+            return RateLimiter.STATE_FILE_NAME
+        else:
+            return f'{preferencesDirectory}{osSep}{RateLimiter.STATE_FILE_NAME}'
+
+    def acquire(self):
+        """
+        Take one request token from the shared bucket, sleeping while the bucket is empty
+
+        Raises:  RateLimitWaitExceeded if no token becomes available within the maximum wait
+        """
+        startTime: float = time()
+        while True:
+            waitTime: float = self._withState(self._takeToken)
+            if waitTime <= 0.0:
+                return
+            if time() - startTime + waitTime > self._maximumWait:
+                raise RateLimitWaitExceeded(f'No API request budget available within {self._maximumWait} seconds')
+
+            self.logger.info(f'API request budget exhausted;  waiting {waitTime:.1f} seconds')
+            sleep(waitTime)
+
+    def observeResponse(self, statusCode: int, headers: Mapping[str, str]):
+        """
+        Feed the server's view of the remaining quota back into the shared bucket
+
+        Args:
+            statusCode: The HTTP status of the response
+            headers:    The response headers
+        """
+        remaining:  float = self._headerAsFloat(headers, RateLimiter.REMAINING_HEADER)
+        resetTime:  float = self._headerAsFloat(headers, RateLimiter.RESET_HEADER)
+        retryAfter: float = self._headerAsFloat(headers, RateLimiter.RETRY_AFTER_HEADER)
+
+        blockedUntil: float = 0.0
+        if retryAfter is not None:
+            blockedUntil = time() + retryAfter
+        elif statusCode == RateLimiter.TOO_MANY_REQUESTS or remaining == 0:
+            blockedUntil = resetTime if resetTime is not None else time() + 1.0 / self._refillRate
+
+        if remaining is None and blockedUntil == 0.0:
+            return
+
+        def clampTokens(state: Dict[str, float]) -> None:
+            if remaining is not None:
+                state[RateLimiter.TOKENS_KEY] = min(state[RateLimiter.TOKENS_KEY], remaining)
+            if blockedUntil > state[RateLimiter.BLOCKED_UNTIL_KEY]:
+                state[RateLimiter.TOKENS_KEY]        = 0.0
+                state[RateLimiter.BLOCKED_UNTIL_KEY] = blockedUntil
+
+        self._withState(clampTokens)
+
+    def instrumentSession(self, session) -> None:
+        """
+        Route every request made through a requests session via this rate limiter
+
+        Args:
+            session:  A requests.Session;  Its request method is wrapped in place
+        """
+        originalRequest: Callable = session.request
+
+        def rateLimitedRequest(*args, **kwargs):
+            self.acquire()
+            response = originalRequest(*args, **kwargs)
+            self.observeResponse(response.status_code, response.headers)
+            return response
+
+        session.request = rateLimitedRequest
+
+    def _takeToken(self, state: Dict[str, float]) -> float:
+        """
+        Returns:  0.0 if a token was taken, else the number of seconds until one should be available
+        """
+        now: float = time()
+        if now < state[RateLimiter.BLOCKED_UNTIL_KEY]:
+            return state[RateLimiter.BLOCKED_UNTIL_KEY] - now
+
+        if state[RateLimiter.TOKENS_KEY] >= 1.0:
+            state[RateLimiter.TOKENS_KEY] -= 1.0
+            return 0.0
+        else:
+            return (1.0 - state[RateLimiter.TOKENS_KEY]) / self._refillRate
+
+    def _withState(self, operation: Callable[[Dict[str, float]], float]) -> float:
+        """
+        Run an operation against the refilled bucket state while holding the state file lock
+
+        Args:
+            operation:  Updates the state in place
+
+        Returns:  Whatever the operation returns
+        """
+        with open(self._stateFileName, 'a+') as stateFile:
+            lockStateFile(stateFile)
+            try:
+                state: Dict[str, float] = self._readState(stateFile)
+                self._refill(state)
+                result = operation(state)
+                stateFile.seek(0)
+                stateFile.truncate()
+                stateFile.write(jsonDumps(state))
+                stateFile.flush()
+            finally:
+                unlockStateFile(stateFile)
+
+        return result
+
+    def _readState(self, stateFile: TextIO) -> Dict[str, float]:
+
+        stateFile.seek(0)
+        try:
+            state: Dict[str, float] = jsonLoads(stateFile.read())
+            return {
+                RateLimiter.TOKENS_KEY:        float(state[RateLimiter.TOKENS_KEY]),
+                RateLimiter.LAST_REFILL_KEY:   float(state[RateLimiter.LAST_REFILL_KEY]),
+                RateLimiter.BLOCKED_UNTIL_KEY: float(state[RateLimiter.BLOCKED_UNTIL_KEY]),
+            }
+        except (JSONDecodeError, KeyError, TypeError, ValueError):
+            self.logger.debug(f'Initializing rate limit state in {self._stateFileName}')
+            return {
+                RateLimiter.TOKENS_KEY:        self._capacity,
+                RateLimiter.LAST_REFILL_KEY:   time(),
+                RateLimiter.BLOCKED_UNTIL_KEY: 0.0,
+            }
+
+    def _refill(self, state: Dict[str, float]):
+
+        now:     float = time()
+        elapsed: float = max(now - state[RateLimiter.LAST_REFILL_KEY], 0.0)
+
+        state[RateLimiter.TOKENS_KEY]      = min(self._capacity, state[RateLimiter.TOKENS_KEY] + elapsed * self._refillRate)
+        state[RateLimiter.LAST_REFILL_KEY] = now
+
+    def _headerAsFloat(self, headers: Mapping[str, str], headerName: str) -> float:
+
+        value: str = headers.get(headerName)
+        if value is None:
+            return cast(float, None)
+        try:
+            return float(value)
+        except ValueError:
+            return cast(float, None)
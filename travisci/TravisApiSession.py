@@ -0,0 +1,49 @@
+from urllib.parse import quote
+
+from requests import Session
+
+from travisci.RateLimiter import RateLimiter
+
+
+class TravisApiSession(Session):
+    """
+    A requests session that talks Travis CI API v3 directly, for callers that want plain
+    JSON instead of PyTravisCI resource objects.  Every request draws from the host-wide
+    API request budget.
+    """
+    def __init__(self, accessPoint: str, apiToken: str, rateLimiter: RateLimiter):
+
+        super().__init__()
+
+        self._accessPoint: str = accessPoint
+
+        self.headers.update({
+            'Travis-API-Version': '3',
+            'Authorization':      f'token {apiToken}',
+        })
+        rateLimiter.instrumentSession(self)
+
+    @property
+    def accessPoint(self) -> str:
+        """
+        The Travis CI API end point this session talks to
+        """
+        return self._accessPoint
+
+    def repositoryUrl(self, repoSlugName: str) -> str:
+        """
+        Args:
+            repoSlugName:  something thing like hasii2011/PyUt
+
+        Returns:  The url of the repository
+        """
+        return f'{self._accessPoint}/repo/{quote(repoSlugName, safe="")}'
+
+    def buildsUrl(self, repoSlugName: str) -> str:
+        """
+        Args:
+            repoSlugName:  something thing like hasii2011/PyUt
+
+        Returns:  The url of the repository's build list
+        """
+        return f'{self.repositoryUrl(repoSlugName)}/builds'
@@ -1,5 +1,9 @@
 from pathlib import Path
+from typing import Callable
+from typing import List
+from typing import Tuple
 from typing import TextIO
+from typing import TypeVar
 from typing import cast
 
 import logging
@@ -13,6 +17,9 @@ from pkg_resources import resource_filename
 from json import load as jsonLoad
 
 from os import sep as osSep
+from os.path import exists as osPathExists
+
+from time import sleep
 
 from PyTravisCI import TravisCI
 from PyTravisCI import defaults
@@ -26,17 +33,40 @@ from click import secho
 from click import open_file
 from click import style
 from click import INT
+from click import Choice
+from click import FloatRange
+from click import IntRange
 from click import Path as clickPath
 from click import clear as clickClear
 from click import echo as clickEcho
 
+from requests import HTTPError
+from requests import RequestException
+
+from PyTravisCI.exceptions import TravisCIError
 from PyTravisCI.resource_types.builds import Builds
 from PyTravisCI.resource_types.repository import Repository
 
+from travisci.AccessPointResolver import AccessPointResolver
+from travisci.BuildHistory import BuildHistory
+from travisci.BuildHistory import BuildHistoryError
+from travisci.BuildStatistics import BuildStatistics
+from travisci.BuildStatistics import WindowStatistics
+from travisci.BuildWatcher import BuildWatcher
+from travisci.BuildWatcher import LatestBuild
+from travisci.DefaultCommandGroup import DefaultCommandGroup
 from travisci.Preferences import Preferences
+from travisci.RateLimiter import RateLimiter
 from travisci.SemanticVersion import SemanticVersion
+from travisci.SemanticVersion import SemanticVersionError
+from travisci.TravisApiSession import TravisApiSession
+from travisci.exceptions.AccessPointNotFound import AccessPointNotFound
+from travisci.exceptions.ApiTokenRejected import ApiTokenRejected
+from travisci.exceptions.RateLimitWaitExceeded import RateLimitWaitExceeded
 from travisci.exceptions.UnsupportedOperation import UnsupportedOperation
 
+Result = TypeVar('Result')
+
 
 class TravisCli:
 
@@ -47,6 +77,13 @@ class TravisCli:
     RESOURCES_PATH:         str = f'travisci{osSep}resources'
     RESOURCE_ENV_VAR:       str = 'RESOURCEPATH'
 
+    ACCESS_POINT_PRIVATE: str = 'private'
+    ACCESS_POINT_OPEN:    str = 'open'
+    ACCESS_POINT_AUTO:    str = 'auto'
+
+    NOT_FOUND_STATUS: int = 404
+    NOT_FOUND_ERROR:  str = 'not_found'
+
     def __init__(self):
 
         self._setupSystemLogging()
@@ -54,14 +91,28 @@ class TravisCli:
 
         Preferences.determinePreferencesLocation()
         self._preferences: Preferences = Preferences()
+        self._accessPointResolver: AccessPointResolver = AccessPointResolver(candidates=(defaults.access_points.PRIVATE, defaults.access_points.OPEN),
+                                                                             sessionFactory=self._createApiSession)
+        self._rateLimiter: RateLimiter = RateLimiter(requestsPerMinute=self._preferences.apiRequestsPerMinute,
+                                                     burstSize=self._preferences.apiBurstSize,
+                                                     maximumWait=self._preferences.apiMaximumWait)
 
         self._buildCount:   int    = 1
+        self._accessPointChoice: str = TravisCli.ACCESS_POINT_PRIVATE
+        self._accessPoint:       str = cast(str, None)
         self._repoSlugName: str    = ''
         self._versionFile:  Path = cast(Path, None)
         self._majorVersion = ''
         self._minorVersion = ''
         self._patchVersion = ''
 
+        self._minimumWatchInterval: float = 30.0
+        self._maximumWatchInterval: float = 600.0
+
+        self._snapshotFile: str             = cast(str, None)
+        self._windowDays:   Tuple[int, ...] = (7, 30, 0)
+        self._topBranches:  int             = 5
+
     def runCommand(self):
 
         repoBuilds:      Builds          = self._getTravisBuilds()
@@ -71,6 +122,59 @@ class TravisCli:
 
         self._updateBuildNumber(semanticVersion=semanticVersion, repoBuilds=repoBuilds)
 
+    def watchCommand(self):
+        """
+        Re-stamp the version file every time a new build appears;  Runs until interrupted
+        """
+        buildWatcher:   BuildWatcher    = self._withAccessPoint(self.__startWatching)
+        stampedVersion: SemanticVersion = self.__readVersionFile()
+        latestBuild:    LatestBuild     = buildWatcher.latestBuild
+        try:
+            while True:
+                if latestBuild is not None and stampedVersion.build != stampedVersion.toBuildNumber(f'+.{latestBuild[0]}'):
+                    # The poll already knows the build number;  Stamp it without asking Travis CI again
+                    try:
+                        semanticVersion: SemanticVersion = self.__getCurrentVersion()
+                        semanticVersion = self._updateVersionNumber(semanticVersion=semanticVersion)
+                        stampedVersion  = self.__updateVersionFile(f'+.{latestBuild[0]}', semanticVersion)
+                    except (OSError, SemanticVersionError) as e:
+                        self.logger.warning(f'Version file not updated: {e}')
+
+                self.logger.debug(f'{latestBuild=} next poll in {buildWatcher.interval} seconds')
+                sleep(buildWatcher.interval)
+                latestBuild = buildWatcher.poll()
+        finally:
+            buildWatcher.close()
+
+    def statsCommand(self):
+        """
+        Stream the repository's build history and report success rates, duration percentiles
+        and throughput per branch.  With a snapshot file only builds newer than the snapshot are fetched.
+        """
+        if self._snapshotFile is not None and osPathExists(self._snapshotFile):
+            buildHistory: BuildHistory = BuildHistory.load(self._snapshotFile, repoSlugName=self._repoSlugName)
+            secho(f'Loaded {len(buildHistory)} builds from {self._snapshotFile}')
+        else:
+            buildHistory = BuildHistory()
+
+        def fetchNewer(accessPoint: str) -> int:
+            apiSession: TravisApiSession = self._createApiSession(accessPoint=accessPoint)
+            try:
+                return buildHistory.fetchNewer(apiSession=apiSession, repoSlugName=self._repoSlugName)
+            finally:
+                apiSession.close()
+
+        added: int = self._withAccessPoint(fetchNewer)
+        secho(f'Fetched {added} builds;  {len(buildHistory)} builds total')
+
+        if self._snapshotFile is not None:
+            buildHistory.save(self._snapshotFile)
+
+        buildStatistics: BuildStatistics        = BuildStatistics(buildHistory)
+        windowStats:     List[WindowStatistics] = buildStatistics.compute(windowDays=self._windowDays, topBranches=self._topBranches)
+
+        self.__reportStatistics(windowStats)
+
     @property
     def buildCount(self) -> int:
         raise UnsupportedOperation('CLI properties are write-only')
@@ -87,6 +191,19 @@ class TravisCli:
     def repoSlugName(self, newValue: str):
         self._repoSlugName = newValue
 
+    @property
+    def accessPoint(self) -> str:
+        raise UnsupportedOperation('CLI properties are write-only')
+
+    @accessPoint.setter
+    def accessPoint(self, newValue: str):
+        """
+        Args:
+            newValue:  One of 'private' (travis-ci.com), 'open' (travis-ci.org) or 'auto'
+        """
+        self._accessPointChoice = newValue
+        self._accessPoint       = cast(str, None)
+
     @property
     def versionFile(self) -> Path:
         raise UnsupportedOperation('CLI properties are write-only')
@@ -119,22 +236,140 @@ class TravisCli:
     def patchVersion(self, newVersion: str):
         self._patchVersion = newVersion
 
+    @property
+    def minimumWatchInterval(self) -> float:
+        raise UnsupportedOperation('CLI properties are write-only')
+
+    @minimumWatchInterval.setter
+    def minimumWatchInterval(self, newValue: float):
+        self._minimumWatchInterval = newValue
+
+    @property
+    def maximumWatchInterval(self) -> float:
+        raise UnsupportedOperation('CLI properties are write-only')
+
+    @maximumWatchInterval.setter
+    def maximumWatchInterval(self, newValue: float):
+        self._maximumWatchInterval = newValue
+
+    @property
+    def snapshotFile(self) -> str:
+        raise UnsupportedOperation('CLI properties are write-only')
+
+    @snapshotFile.setter
+    def snapshotFile(self, fileName: str):
+        self._snapshotFile = fileName
+
+    @property
+    def windowDays(self) -> Tuple[int, ...]:
+        raise UnsupportedOperation('CLI properties are write-only')
+
+    @windowDays.setter
+    def windowDays(self, newValue: Tuple[int, ...]):
+        self._windowDays = newValue
+
+    @property
+    def topBranches(self) -> int:
+        raise UnsupportedOperation('CLI properties are write-only')
+
+    @topBranches.setter
+    def topBranches(self, newValue: int):
+        self._topBranches = newValue
+
     def _getTravisBuilds(self) -> Builds:
         """
         Get a set of builds from Travis CI for the selected repository
 
         Returns:  The Travis builds
         """
+        def getBuilds(accessPoint: str) -> Builds:
+            travisCI: TravisCI = self._createTravisCI(accessPoint=accessPoint)
+
+            params = {'limit': self._buildCount}
+            repository: Repository = travisCI.get_repository(self._repoSlugName)
+            return repository.get_builds(params=params)
+
+        travisBuilds: Builds = self._withAccessPoint(getBuilds)
+
+        return travisBuilds
+
+    def _getAccessPoint(self) -> str:
+        """
+        Translate the access point choice into a Travis CI API end point.  In auto mode the
+        end point that hosts the repository is detected once and remembered per repository slug.
+
+        Returns:  The Travis CI API end point
+        """
+        if self._accessPoint is None:
+            if self._accessPointChoice == TravisCli.ACCESS_POINT_OPEN:
+                self._accessPoint = defaults.access_points.OPEN
+            elif self._accessPointChoice == TravisCli.ACCESS_POINT_AUTO:
+                self._accessPoint = self._accessPointResolver.resolve(self._repoSlugName)
+            else:
+                self._accessPoint = defaults.access_points.PRIVATE
+
+        return self._accessPoint
+
+    def _withAccessPoint(self, operation: Callable[[str], Result]) -> Result:
+        """
+        Run an operation against the selected end point.  In auto mode a repository that is not
+        found at its remembered end point has probably moved;  The end point is forgotten, probed
+        again and the operation retried once.
+
+        Args:
+            operation:  Takes the Travis CI API end point
+
+        Returns:  Whatever the operation returns
+        """
+        accessPoint: str = self._getAccessPoint()
+        try:
+            return operation(accessPoint)
+        except (TravisCIError, HTTPError) as e:
+            if self._accessPointChoice != TravisCli.ACCESS_POINT_AUTO or self.__isNotFound(e) is False:
+                raise
+            self.logger.warning(f'{self._repoSlugName} not found at {accessPoint};  Probing the end points again')
+
+        self._accessPointResolver.forget(self._repoSlugName)
+        self._accessPoint = cast(str, None)
+
+        return operation(self._getAccessPoint())
+
+    def _createTravisCI(self, accessPoint: str) -> TravisCI:
+        """
+        Create a Travis CI client whose requests all draw from the host-wide API request budget
+
+        Args:
+            accessPoint:  The Travis CI API end point
+
+        Returns:  The rate limited client
+        """
         travisciApiToken: str = self._preferences.travisciApiToken
         self.logger.debug(f'Running Command with token: {travisciApiToken}')
 
-        travisCI: TravisCI = TravisCI(access_token=travisciApiToken, access_point=defaults.access_points.PRIVATE)
+        travisCI: TravisCI = TravisCI(access_token=travisciApiToken, access_point=accessPoint)
 
-        params = {'limit': self._buildCount}
-        repository: Repository = travisCI.get_repository(self._repoSlugName)
-        travisBuilds: Builds = repository.get_builds(params=params)
+        # PyTravisCI 2.0.x keeps its requester in the private (name mangled) TravisCI.__requester
+        requester = getattr(travisCI, '_TravisCI__requester', None)
+        if requester is None:
+            requester = getattr(travisCI, 'requester', None)
+        session = getattr(requester, 'session', None)
+        if session is None:
+            self.logger.warning('Unable to locate the Travis CI session;  API requests are not rate limited')
+        else:
+            self._rateLimiter.instrumentSession(session)
 
-        return travisBuilds
+        return travisCI
+
+    def _createApiSession(self, accessPoint: str) -> TravisApiSession:
+        """
+        Create a plain JSON Travis CI session that draws from the host-wide API request budget
+
+        Args:
+            accessPoint:  The Travis CI API end point
+
+        Returns:  The rate limited session
+        """
+        return TravisApiSession(accessPoint=accessPoint, apiToken=self._preferences.travisciApiToken, rateLimiter=self._rateLimiter)
 
     def _updateVersionNumber(self, semanticVersion: SemanticVersion) -> SemanticVersion:
         """
@@ -220,20 +455,58 @@ class TravisCli:
 
         return highestBuildNumber
 
+    def __startWatching(self, accessPoint: str) -> BuildWatcher:
+
+        buildWatcher: BuildWatcher = BuildWatcher(apiSession=self._createApiSession(accessPoint=accessPoint),
+                                                  repoSlugName=self._repoSlugName,
+                                                  minimumInterval=self._minimumWatchInterval,
+                                                  maximumInterval=self._maximumWatchInterval)
+        try:
+            buildWatcher.start()
+        except (RequestException, ValueError):
+            buildWatcher.close()
+            raise
+
+        return buildWatcher
+
+    def __isNotFound(self, e: Exception) -> bool:
+
+        if isinstance(e, TravisCIError):
+            return e.err_type == TravisCli.NOT_FOUND_ERROR
+        else:
+            return e.response is not None and e.response.status_code == TravisCli.NOT_FOUND_STATUS
+
     def __getCurrentVersion(self) -> SemanticVersion:
         """
         Reads the version text file that is in semantic version format
 
         Returns:  The semantic version object that represents the current version stored in the text file
         """
+        semanticVersion: SemanticVersion = self.__readVersionFile()
+
+        secho(f'Old Version: {semanticVersion}')
+
+        return semanticVersion
+
+    def __readVersionFile(self) -> SemanticVersion:
+        """
+        Returns:  The semantic version currently stored in the version text file
+        """
         readDescriptor:  TextIO          = open_file(self._versionFile, mode='r')
         semanticVersion: SemanticVersion = SemanticVersion(readDescriptor.read())
         readDescriptor.close()
 
-        secho(f'Old Version: {semanticVersion}')
-
         return semanticVersion
 
+    def __reportStatistics(self, windowStats: List[WindowStatistics]):
+
+        header: str = f'{"Window":>8}  {"Branch":<30} {"Builds":>7} {"Success":>8} {"p50":>7} {"p90":>7} {"p95":>7} {"Per day":>8}'
+        clickEcho(style(header, bold=True))
+        for stats in windowStats:
+            window: str = 'all' if stats.windowDays == 0 else f'{stats.windowDays}d'
+            clickEcho(f'{window:>8}  {stats.branch[:30]:<30} {stats.buildCount:>7} {stats.successRate:>8.1%} '
+                      f'{stats.p50Duration:>7.0f} {stats.p90Duration:>7.0f} {stats.p95Duration:>7.0f} {stats.buildsPerDay:>8.2f}')
+
     def __updateVersionFile(self, normalizedBuildNumber: str, semanticVersion: SemanticVersion) -> SemanticVersion:
         """
         Updates the version text file
@@ -256,12 +529,19 @@ class TravisCli:
 @command()
 @option('-b', '--build-count',     default=5,      type=INT, help='Number builds to check.')
 @option('-r', '--repo-slug',   required=True,  help='something thing like hasii2011/PyUt.')
+@option('-a', '--access-point', default=TravisCli.ACCESS_POINT_PRIVATE, show_default=True,
+        type=Choice([TravisCli.ACCESS_POINT_PRIVATE, TravisCli.ACCESS_POINT_OPEN, TravisCli.ACCESS_POINT_AUTO]),
+        help='Travis CI end point;  auto detects and remembers the one hosting the repository')
 @option('-f', '--file',        default='travisci/resources/version.txt', type=clickPath(exists=True),  help='Relative location of version text file')
 @option('--major-version',     required=False, type=INT, help='Change the major number to the specified one')
 @option('--minor-version',     required=False, type=INT, help='Change the minor number to the specified one')
 @option('--patch-version',     required=False, type=INT, help='Change the patch number to the specified one')
+@option('-w', '--watch',       is_flag=True,   help='Keep running and re-stamp the version file whenever a new build appears')
+@option('--watch-interval',    default=30.0,   type=FloatRange(min=1.0), help='Fastest watch poll interval in seconds')
+@option('--watch-max-interval', default=600.0, type=FloatRange(min=1.0), help='Slowest watch poll interval in seconds when idle')
 @version_option(version='0.3.2', message='%(version)s')
-def commandHandler(build_count: int, repo_slug: str, file: TextIO, major_version: int, minor_version: int, patch_version: int):
+def commandHandler(build_count: int, repo_slug: str, access_point: str, file: TextIO, major_version: int, minor_version: int, patch_version: int,
+                   watch: bool, watch_interval: float, watch_max_interval: float):
     """
     Use this command to get the Travis CI build number of your project.  Assumes you are using Semantic Versioning
     """
@@ -272,6 +552,7 @@ def commandHandler(build_count: int, repo_slug: str, file: TextIO, major_version
 
     travisCmd.buildCount   = build_count
     travisCmd.repoSlugName = repo_slug
+    travisCmd.accessPoint  = access_point
     travisCmd.versionFile  = file
 
     ctx: Context = get_current_context()
@@ -283,10 +564,65 @@ def commandHandler(build_count: int, repo_slug: str, file: TextIO, major_version
     travisCmd.minorVersion = minor_version
     travisCmd.patchVersion = patch_version
 
+    travisCmd.minimumWatchInterval = watch_interval
+    travisCmd.maximumWatchInterval = watch_max_interval
+
     # Launch travisCmd
-    travisCmd.runCommand()
+    try:
+        if watch is True:
+            travisCmd.watchCommand()
+        else:
+            travisCmd.runCommand()
+    except (RateLimitWaitExceeded, AccessPointNotFound, ApiTokenRejected) as e:
+        secho(f'{e}', fg='red')
+        ctx.exit(1)
+    except (TravisCIError, RequestException) as e:
+        secho(f'Travis CI request failed: {e}', fg='red')
+        ctx.exit(1)
+    except KeyboardInterrupt:
+        clickEcho('Stopped watching')
+
+
+@command()
+@option('-r', '--repo-slug',     required=True,  help='something thing like hasii2011/PyUt.')
+@option('-a', '--access-point',  default=TravisCli.ACCESS_POINT_PRIVATE, show_default=True,
+        type=Choice([TravisCli.ACCESS_POINT_PRIVATE, TravisCli.ACCESS_POINT_OPEN, TravisCli.ACCESS_POINT_AUTO]),
+        help='Travis CI end point;  auto detects and remembers the one hosting the repository')
+@option('-s', '--snapshot',      required=False, type=clickPath(dir_okay=False), help='Compact build history snapshot;  Later runs only fetch newer builds')
+@option('-w', '--window-days',   multiple=True,  type=IntRange(min=0), default=(7, 30, 0), show_default=True, help='Statistics windows in days;  0 is the full history')
+@option('-t', '--top-branches',  default=5,      type=IntRange(min=0), help='Number of busiest branches to report')
+def statsHandler(repo_slug: str, access_point: str, snapshot: str, window_days: Tuple[int, ...], top_branches: int):
+    """
+    Report build success rates, duration percentiles (seconds) and throughput per branch
+    """
+    travisCmd: TravisCli = TravisCli()
+
+    travisCmd.repoSlugName = repo_slug
+    travisCmd.accessPoint  = access_point
+    travisCmd.snapshotFile = snapshot
+    travisCmd.windowDays   = window_days
+    travisCmd.topBranches  = top_branches
+
+    ctx: Context = get_current_context()
+    try:
+        travisCmd.statsCommand()
+    except (RateLimitWaitExceeded, AccessPointNotFound, ApiTokenRejected) as e:
+        secho(f'{e}', fg='red')
+        ctx.exit(1)
+    except BuildHistoryError as e:
+        secho(f'{e}', fg='red')
+        ctx.exit(1)
+    except RequestException as e:
+        secho(f'Travis CI request failed: {e}', fg='red')
+        ctx.exit(1)
+
+
+mainHandler: DefaultCommandGroup = DefaultCommandGroup(name='traviscli', defaultCommandName='update',
+                                                       commands={'update': commandHandler, 'stats': statsHandler},
+                                                       help='Stamp Travis CI build numbers into version files and report build statistics.  '
+                                                            'Without a command the update options apply, e.g. traviscli -r hasii2011/PyUt')
 
 
 if __name__ == "__main__":
 
-    commandHandler()
+    mainHandler()
@@ -0,0 +1,3 @@
+
+class AccessPointNotFound(Exception):
+    pass
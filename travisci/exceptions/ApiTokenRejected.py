@@ -0,0 +1,3 @@
+
+class ApiTokenRejected(Exception):
+    pass
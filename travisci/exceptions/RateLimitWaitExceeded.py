@@ -0,0 +1,3 @@
+
+class RateLimitWaitExceeded(Exception):
+    pass